@@ -182,7 +182,7 @@ class HealthCheck(BaseModel):
     version: str
 
 # API Routes
-@app.get("/health", response_model=HealthCheck)
+@app.api_route("/health", methods=["GET", "HEAD"], response_model=HealthCheck)
 async def health_check():
     """Health check endpoint to verify API is running"""
     return {
@@ -5,7 +5,6 @@ This version uses direct imports but keeps the code clean and modular.
 """
 
 import streamlit as st
-import traceback
 import logging
 import requests
 import sys
@@ -13,9 +12,12 @@ import os
 from pathlib import Path
 import json
 import time
-import socket
 import re
-from youtube_transcript_api import YouTubeTranscriptApi
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 # Fix import path
 # Get the path to the parent directory of the Listening_Learning_App folder
@@ -23,6 +25,24 @@ current_file = Path(__file__).resolve()
 project_root = current_file.parent.parent  # Go up to Listening_Learning_App directory
 sys.path.insert(0, str(project_root))  # Add to Python path
 
+from frontend.utils.network import (
+    probe_ports,
+    BACKEND_SESSION,
+    OLLAMA_SESSION,
+    OLLAMA_URL,
+    BACKEND_DISCOVERY_TTL,
+    get_ollama_timeout,
+    OLLAMA_TIMEOUT,
+    OLLAMA_MIN_TIMEOUT,
+    OLLAMA_MAX_TIMEOUT,
+)
+from frontend.utils.youtube_urls import (
+    YOUTUBE_ID_PATTERN,
+    VIDEO_ID_PATTERN,
+    YOUTUBE_WATCH_URL,
+    YOUTUBE_TIMESTAMP_URL,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,150 +64,252 @@ APP_STATES = {
 # Additional app states
 APP_STATE_EXTRACT_QUESTIONS = "EXTRACT_QUESTIONS"
 
-# Function to check for Ollama availability
-def check_ollama_availability():
-    """Check if Ollama is available and set session state accordingly"""
-    logger.info("Checking Ollama availability...")
+# Default session state values, set once per session by initialize_session_state.
+# Keep these immutable; a mutable default would be shared by every session.
+SESSION_DEFAULTS = {
+    "app_state": APP_STATES["HOME"],
+    "backend_available": False,
+    "ollama_available": False,
+    "ollama_model": "mistral",
+    "ollama_timeout": OLLAMA_TIMEOUT,
+    # Question extraction page state
+    "youtube_url": "",
+    "youtube_video_id": None,
+    "extracted_content": None,
+}
+
+# Static intro text for the home page
+HOME_INTRO_MARKDOWN = """
+Welcome to the Japanese Listening Practice app! This application will help you improve your Japanese 
+listening comprehension skills using authentic content from YouTube or AI-generated JLPT-style exercises.
+
+## Features
+
+- Practice with real Japanese content from YouTube
+- Generate JLPT-style listening exercises with audio
+- Extract questions directly from Japanese YouTube videos
+- Get automatic transcriptions and translations
+- Answer comprehension questions
+- Track your progress over time
+
+## How to Use
+
+1. Choose the type of practice you want
+2. Listen to the audio and try to understand
+3. Answer the comprehension questions
+4. Review your results and learn from mistakes
+"""
+
+# Japanese question detection patterns, compiled once at import. Each one is
+# scanned separately: a single alternation would stop at the first alternative
+# that matches at each position and miss the overlapping matches the others find.
+QUESTION_PATTERNS = (
+    # Pattern for questions ending with ka (か) and question mark
+    re.compile(r'([^。？！]*[か][？])'),
+    # Pattern for questions ending with ka (か) and period
+    re.compile(r'([^。？！]*[か][。])'),
+    # Pattern for questions ending with a question mark
+    re.compile(r'([^。？！]*[？])'),
+    # Pattern for polite questions
+    re.compile(r'([^。？！]*(?:ですか|ますか|のですか|のでしょうか)[？。]?)'),
+    # Pattern for questions with interrogatives
+    re.compile(r'([^。？！]*(?:何|なに|どう|なぜ|どこ|誰|だれ|いつ|どんな|どの)[^。？！]*[か][？。]?)')
+)
+
+# Question extraction methods offered on the extract page
+EXTRACTION_METHODS = (
+    "字幕から抽出 (Extract from Captions)",
+    "AI抽出 (Whisper + Ollama)"
+)
+
+# Standard Ollama models that might be available
+STANDARD_OLLAMA_MODELS = ("llama3.2:1b", "llama3", "mistral", "gemma", "codellama", "phi3", "wizardcoder", "solar", "qwen")
+
+# Read config.json once per process
+@lru_cache(maxsize=1)
+def _read_config():
+    config_path = Path(__file__).parent.parent / "config.json"
+    if not config_path.exists():
+        return {}
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+# Load configuration
+def load_config():
+    """
+    Load the app configuration from config.json
     
-    # First try to get the preferred model from config
-    preferred_model = "llama3.2:1b"
+    The file is parsed on first use and cached for the life of the process;
+    a copy is returned so callers can't modify the cached dict.
+    """
     try:
-        config_path = Path(__file__).parent.parent / "config.json"
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                if "ollama_model" in config:
-                    preferred_model = config["ollama_model"]
-                    logger.info(f"Found preferred Ollama model in config: {preferred_model}")
+        return dict(_read_config())
     except Exception as e:
-        logger.warning(f"Error reading Ollama model from config: {e}")
+        logger.warning(f"Error reading config: {e}")
+        return {}
+
+# Probe the local Ollama server
+def probe_ollama():
+    """
+    Ask Ollama whether it is running and which models it has
+    
+    Touches no session state, so it can run on a worker thread.
     
+    Returns:
+        tuple: (available, models), where models is the list of model names,
+        or None if Ollama is running but didn't report its models
+    """
     try:
-        # Try to get available models from Ollama
+        # Try tags endpoint first which shows available models
+        response = OLLAMA_SESSION.get(f"{OLLAMA_URL}/api/tags", timeout=2)
+        if response.status_code == 200:
+            return True, [model["name"] for model in response.json().get("models", [])]
+    except Exception as e:
+        # If tags endpoint fails, try version endpoint
+        logger.warning(f"Error checking Ollama tags: {e}")
+        
         try:
-            # Try tags endpoint first which shows available models
-            response = requests.get("http://localhost:11434/api/tags", timeout=2)
+            response = OLLAMA_SESSION.get(f"{OLLAMA_URL}/api/version", timeout=2)
             if response.status_code == 200:
-                st.session_state["ollama_available"] = True
-                
-                # Parse the models from the response
-                models_data = response.json()
-                available_models = [model["name"] for model in models_data.get("models", [])]
-                logger.info(f"Available Ollama models: {available_models}")
-                
-                # Set the model in the session state
-                if available_models:
-                    # Try to use the preferred model if available
-                    if preferred_model in available_models:
-                        st.session_state["ollama_model"] = preferred_model
-                    else:
-                        # Otherwise use the first available model
-                        st.session_state["ollama_model"] = available_models[0]
-                    
-                    logger.info(f"Using Ollama model: {st.session_state['ollama_model']}")
-                else:
-                    # No models available, but Ollama is running
-                    st.session_state["ollama_model"] = preferred_model
-                    logger.warning(f"No models available in Ollama. Using default: {preferred_model}")
-                
-                return
-        except Exception as e:
-            # If tags endpoint fails, try version endpoint
-            logger.warning(f"Error checking Ollama tags: {e}")
-            
-            try:
-                response = requests.get("http://localhost:11434/api/version", timeout=2)
-                if response.status_code == 200:
-                    # Ollama is running but we couldn't get models
-                    st.session_state["ollama_available"] = True
-                    st.session_state["ollama_model"] = preferred_model
-                    logger.info(f"Ollama is available but couldn't get models. Using default: {preferred_model}")
-                    return
-            except Exception as e2:
-                logger.warning(f"Error checking Ollama version: {e2}")
-        
-        # If we get here, Ollama is not available
+                return True, None
+        except Exception as e2:
+            logger.warning(f"Error checking Ollama version: {e2}")
+    
+    return False, None
+
+# Function to check for Ollama availability
+def check_ollama_availability(probe_result=None):
+    """
+    Check if Ollama is available and set session state accordingly
+    
+    Parameters:
+        probe_result (tuple): probe_ollama() result if it has already been
+            run, e.g. on a worker thread; otherwise Ollama is probed here
+    """
+    logger.info("Checking Ollama availability...")
+    
+    # Remember that this session has probed Ollama, whatever the outcome
+    st.session_state["ollama_checked"] = True
+    st.session_state["ollama_models"] = []
+    
+    # First try to get the preferred model from config
+    preferred_model = "llama3.2:1b"
+    config = load_config()
+    if "ollama_model" in config:
+        preferred_model = config["ollama_model"]
+        logger.info(f"Found preferred Ollama model in config: {preferred_model}")
+    
+    available, available_models = probe_result if probe_result is not None else probe_ollama()
+    st.session_state["ollama_available"] = available
+    
+    if not available:
         logger.warning("Ollama is not available - couldn't connect to API")
-        st.session_state["ollama_available"] = False
         st.session_state["ollama_model"] = preferred_model  # Still store the preferred model
+        return
+    
+    if available_models is None:
+        # Ollama is running but we couldn't get models
+        st.session_state["ollama_model"] = preferred_model
+        logger.info(f"Ollama is available but couldn't get models. Using default: {preferred_model}")
+        return
+    
+    st.session_state["ollama_models"] = available_models
+    logger.info(f"Available Ollama models: {available_models}")
+    
+    # Set the model in the session state
+    if available_models:
+        # Try to use the preferred model if available
+        if preferred_model in available_models:
+            st.session_state["ollama_model"] = preferred_model
+        else:
+            # Otherwise use the first available model
+            st.session_state["ollama_model"] = available_models[0]
         
-    except Exception as e:
-        logger.error(f"Error in Ollama availability check: {str(e)}")
-        st.session_state["ollama_available"] = False
+        logger.info(f"Using Ollama model: {st.session_state['ollama_model']}")
+    else:
+        # No models available, but Ollama is running
         st.session_state["ollama_model"] = preferred_model
+        logger.warning(f"No models available in Ollama. Using default: {preferred_model}")
 
-# Is port in use
-def is_port_in_use(port):
-    """Check if a port is in use"""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
+# Check a single backend port
+def check_backend_health(port, timeout):
+    """Return True if a backend server answers /health on the given port"""
+    url = f"http://localhost:{port}/health"
+    try:
+        # HEAD only transfers headers; older backends without HEAD support answer 405
+        response = BACKEND_SESSION.head(url, timeout=timeout, allow_redirects=False)
+        if response.status_code == 405:
+            with BACKEND_SESSION.get(url, timeout=timeout, stream=True) as response:
+                return response.status_code == 200
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
 
 # Find backend server
 def find_backend_server():
     """
     Find the backend server by checking common ports.
     Returns the backend URL if found, otherwise None.
+    
+    A quick TCP sweep first narrows the candidates to ports that are open,
+    then those are probed concurrently, so a missing backend costs one
+    probe timeout instead of one per port.
     """
     logger.info("Searching for backend server...")
-    backend_url = None
+    candidate_ports = []
     
-    # First try to read from config file
-    try:
-        config_path = Path(__file__).parent.parent / "config.json"
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                backend_port = config.get('backend_port')
-                if backend_port:
-                    logger.info(f"Found backend port {backend_port} in config file")
-                    # Try this port first
-                    try:
-                        url = f"http://localhost:{backend_port}/health"
-                        response = requests.get(url, timeout=1)
-                        if response.status_code == 200:
-                            backend_url = f"http://localhost:{backend_port}"
-                            logger.info(f"Successfully connected to backend at {backend_url}")
-                            return backend_url
-                    except:
-                        logger.warning(f"Backend not found on configured port {backend_port}")
-    except Exception as e:
-        logger.warning(f"Could not read backend port from config: {e}")
+    # First try the port from the config file
+    backend_port = load_config().get('backend_port')
+    if backend_port:
+        logger.info(f"Found backend port {backend_port} in config file")
+        try:
+            candidate_ports.append(int(backend_port))
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring invalid backend port in config: {backend_port}")
     
-    # Check common ports including the specific port 8040 used in your logs
-    default_ports = [8040, 8000, 8080, 5000]
+    # The configured port is almost always right, so try it alone before scanning
+    if candidate_ports and check_backend_health(candidate_ports[0], 0.2):
+        backend_url = f"http://localhost:{candidate_ports[0]}"
+        logger.info(f"Found backend server at: {backend_url}")
+        return backend_url
     
-    # First check default ports
-    for port in default_ports:
-        try:
-            url = f"http://localhost:{port}/health"
-            response = requests.get(url, timeout=0.5)
-            if response.status_code == 200:
-                backend_url = f"http://localhost:{port}"
-                logger.info(f"Found backend server at: {backend_url}")
-                return backend_url
-        except:
-            continue
+    # Check common ports including the specific port 8040 used in your logs,
+    # then the range around 8040 where the backend is likely running
+    for port in [8040, 8000, 8080, 5000] + list(range(8030, 8050)):
+        if port not in candidate_ports:
+            candidate_ports.append(port)
     
-    # Narrow the port range to be more efficient
-    # Focus on ports around 8040 where the backend is likely running
-    range_ports = list(range(8030, 8050))
-    logger.info(f"Checking port range {range_ports[0]}-{range_ports[-1]} for backend server...")
+    # Only send /health to ports where something is actually listening
+    open_ports = probe_ports(candidate_ports, timeout=0.05)
+    if not open_ports:
+        logger.warning("Could not find a running backend server")
+        return None
     
-    for port in range_ports:
-        try:
-            url = f"http://localhost:{port}/health"
-            response = requests.get(url, timeout=0.2)  # Use shorter timeout for range scan
-            if response.status_code == 200:
-                backend_url = f"http://localhost:{port}"
+    executor = ThreadPoolExecutor(max_workers=len(open_ports))
+    try:
+        futures = {executor.submit(check_backend_health, port, 0.5): port for port in open_ports}
+        for future in as_completed(futures):
+            if future.result():
+                backend_url = f"http://localhost:{futures[future]}"
                 logger.info(f"Found backend server at: {backend_url}")
                 return backend_url
-        except:
-            continue
+    finally:
+        # Don't wait for the probes that are still in flight
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    logger.warning("Could not find a running backend server")
+    return None
 
-    if not backend_url:
-        logger.warning("Could not find a running backend server")
+# Whether this session's backend discovery result has expired
+def backend_discovery_due():
+    checked_at = st.session_state.get("backend_checked_at")
+    return checked_at is None or time.monotonic() - checked_at > BACKEND_DISCOVERY_TTL
 
-    return backend_url
+# Store a backend discovery result in session state
+def store_backend_url(backend_url):
+    st.session_state["backend_url"] = backend_url
+    st.session_state["backend_available"] = backend_url is not None
+    st.session_state["backend_checked_at"] = time.monotonic()
 
 # Navigation functions
 def go_to_home():
@@ -203,25 +325,28 @@ def go_to_extract_questions():
     st.session_state.app_state = APP_STATE_EXTRACT_QUESTIONS
     
     # Clear any previous extraction results when navigating to the page
-    if "extracted_content" in st.session_state:
-        del st.session_state["extracted_content"]
+    st.session_state["extracted_content"] = None
+
+def start_direct_extraction():
+    """Open the extract questions page for the URL entered on the video selection page"""
+    youtube_url = st.session_state.get("direct_extract_url", "")
+    if youtube_url:
+        st.session_state["youtube_url"] = youtube_url
+        go_to_extract_questions()
+
+def leave_extraction(navigate):
+    """Clear extraction results, then navigate with the given function"""
+    st.session_state["extracted_content"] = None
+    navigate()
 
 # Initialize session state
 def initialize_session_state():
     """Initialize session state variables"""
-    if "app_state" not in st.session_state:
-        st.session_state["app_state"] = APP_STATES["HOME"]
-        
-    # Check if backend is running
-    if "backend_available" not in st.session_state:
-        st.session_state["backend_available"] = False
-        
-    # Check if Ollama is available
-    if "ollama_available" not in st.session_state:
-        st.session_state["ollama_available"] = False
-        st.session_state["ollama_model"] = "mistral"
+    for key, value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
 
-# Extract YouTube ID
+# Extract YouTube ID (memoized, since reruns parse the same URL again)
+@lru_cache(maxsize=256)
 def extract_youtube_id(url):
     """
     Extract the video ID from a YouTube URL
@@ -244,23 +369,14 @@ def extract_youtube_id(url):
         
     if url.startswith("'") and url.endswith("'"):
         url = url[1:-1]  # Remove quotes
+    
+    # Bare IDs are common and can't match any URL pattern, so check them first
+    if VIDEO_ID_PATTERN.fullmatch(url):
+        return url
         
-    # YouTube URL patterns
-    patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/watch\?v=|youtu\.be\/)([^\/&\?#\s]+)',  # Standard and shortened
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([^\/&\?#\s]+)',  # Embed URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/v\/([^\/&\?#\s]+)',      # Old embed URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/user\/[^\/]+\/([^\/&\?#\s]+)', # User URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/.*[?&]v=([^&\s]+)'       # Other formats with v parameter
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            video_id = match.group(1)
-            # Validate the video ID format (should be 11 characters for standard videos)
-            if 11 <= len(video_id) <= 12:
-                return video_id
+    match = YOUTUBE_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
     
     # If no patterns match, this might be a direct video ID
     if 11 <= len(url) <= 12 and url.isalnum() or url.replace('-', '').replace('_', '').isalnum():
@@ -291,24 +407,30 @@ def extract_questions_from_youtube(video_url):
         st.info(f"処理中のビデオID: {video_id} (Processing video ID: {video_id})")
         
         # Get transcript using youtube_transcript_api (open source)
+        # Imported here so pages that never fetch transcripts don't pay for it
+        from youtube_transcript_api import YouTubeTranscriptApi
+        # List the video's transcripts once, then pick from that list locally
         try:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['ja', 'ja-JP'])
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        except Exception as e:
+            st.error(f"いずれの字幕も取得できませんでした: {str(e)} (Failed to get any transcript)")
+            st.error("このビデオに利用可能な字幕がありません。(No transcript available for this video.)")
+            return None
+        
+        try:
+            # Manually created Japanese captions are preferred over auto-generated ones
+            transcript = transcript_list.find_transcript(['ja', 'ja-JP']).fetch()
             st.success("日本語字幕を正常に取得しました！(Japanese transcript successfully retrieved!)")
         except Exception as e:
             st.error(f"日本語字幕の取得に失敗しました: {str(e)} (Failed to get Japanese transcript)")
             st.info("いずれかの利用可能な字幕を取得しようとしています... (Trying to get any available transcript...)")
             try:
-                transcript = YouTubeTranscriptApi.get_transcript(video_id)
+                transcript = next(iter(transcript_list)).fetch()
                 st.success("字幕を取得しました（非日本語）。(Transcript retrieved (non-Japanese).)")
             except Exception as e2:
                 st.error(f"いずれの字幕も取得できませんでした: {str(e2)} (Failed to get any transcript)")
-                # Try to get auto-generated transcript as last resort
-                try:
-                    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['ja', 'en', 'auto'])
-                    st.success("自動生成された字幕を取得しました。(Auto-generated transcript retrieved.)")
-                except Exception as e3:
-                    st.error("このビデオに利用可能な字幕がありません。(No transcript available for this video.)")
-                    return None
+                st.error("このビデオに利用可能な字幕がありません。(No transcript available for this video.)")
+                return None
             
         # Clean and format transcript for processing
         formatted_transcript = []
@@ -334,8 +456,8 @@ def extract_questions_from_youtube(video_url):
             st.write(f"取得した字幕セグメント: {len(formatted_transcript)}個 (Found {len(formatted_transcript)} transcript segments)")
             if len(formatted_transcript) > 0:
                 st.write("字幕の内容 (Transcript content):")
-                for segment in formatted_transcript[:20]:  # Show first 20 segments to avoid overwhelming the UI
-                    st.write(f"{segment['start']:.1f}s: {segment['text']}")
+                # First 20 segments as one text element, to avoid overwhelming the UI
+                st.text("\n".join(f"{segment['start']:.1f}s: {segment['text']}" for segment in formatted_transcript[:20]))
         
         # Combine segments into meaningful units for better context
         cleaned_transcript = []
@@ -385,27 +507,16 @@ def extract_questions_from_youtube(video_url):
         full_text = " ".join([segment["text"] for segment in cleaned_transcript])
         st.info(f"字幕内の文字数: {len(full_text)}文字 (Transcript length: {len(full_text)} characters)")
         
-        # Japanese question detection patterns
-        question_patterns = [
-            # Pattern for questions ending with ka (か) and question mark
-            r'([^。？！]*[か][？])',
-            # Pattern for questions ending with ka (か) and period
-            r'([^。？！]*[か][。])',
-            # Pattern for questions ending with a question mark
-            r'([^。？！]*[？])',
-            # Pattern for polite questions
-            r'([^。？！]*(?:ですか|ますか|のですか|のでしょうか)[？。]?)',
-            # Pattern for questions with interrogatives
-            r'([^。？！]*(?:何|なに|どう|なぜ|どこ|誰|だれ|いつ|どんな|どの)[^。？！]*[か][？。]?)'
-        ]
+        # Question texts already added, for duplicate checks
+        seen_questions = set()
         
         # Process each segment for questions
         for segment_idx, segment in enumerate(cleaned_transcript):
             segment_text = segment["text"]
             
             # Apply each pattern to find questions in this segment
-            for pattern in question_patterns:
-                matches = re.finditer(pattern, segment_text)
+            for pattern in QUESTION_PATTERNS:
+                matches = pattern.finditer(segment_text)
                 for match in matches:
                     question_text = match.group(0).strip()
                     
@@ -413,8 +524,9 @@ def extract_questions_from_youtube(video_url):
                     if len(question_text) < 10:
                         continue
                         
-                    if question_text in [q["question_text"] for q in actual_questions]:
+                    if question_text in seen_questions:
                         continue
+                    seen_questions.add(question_text)
                     
                     # Get context (surrounding segments)
                     # Get more context for better understanding
@@ -477,6 +589,42 @@ def extract_questions_from_youtube(video_url):
         st.exception(e)  # Show the full exception for debugging
         return None
 
+# Cache caption extraction results per URL
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_extract_from_captions(video_url):
+    """
+    Extract questions from a YouTube video's captions, cached for an hour
+    
+    Parameters:
+        video_url (str): YouTube URL
+    
+    Returns:
+        dict: Dictionary with extracted content
+    
+    Raises:
+        ValueError: If nothing could be extracted; raising keeps the failure out of the cache
+    """
+    result = extract_questions_from_youtube(video_url)
+    if not result:
+        raise ValueError(f"No questions or conversations found for {video_url}")
+    return result
+
+# Extract from captions through the cache, without caching failures
+def extract_from_captions(video_url):
+    """
+    Extract questions from a YouTube video's captions
+    
+    Parameters:
+        video_url (str): YouTube URL
+    
+    Returns:
+        dict: Dictionary with extracted content, or None if nothing was found
+    """
+    try:
+        return _cached_extract_from_captions(video_url)
+    except ValueError:
+        return None
+
 # Extract conversations from transcript
 def extract_conversations(transcript_segments, min_length=50, max_segments=5):
     """
@@ -633,26 +781,7 @@ def render_home():
     """Render the home page"""
     st.title("Japanese Listening Practice")
     
-    st.markdown("""
-    Welcome to the Japanese Listening Practice app! This application will help you improve your Japanese 
-    listening comprehension skills using authentic content from YouTube or AI-generated JLPT-style exercises.
-    
-    ## Features
-    
-    - Practice with real Japanese content from YouTube
-    - Generate JLPT-style listening exercises with audio
-    - Extract questions directly from Japanese YouTube videos
-    - Get automatic transcriptions and translations
-    - Answer comprehension questions
-    - Track your progress over time
-    
-    ## How to Use
-    
-    1. Choose the type of practice you want
-    2. Listen to the audio and try to understand
-    3. Answer the comprehension questions
-    4. Review your results and learn from mistakes
-    """)
+    st.markdown(HOME_INTRO_MARKDOWN)
     
     st.write("### Choose Practice Type")
     col1, col2, col3 = st.columns(3)
@@ -697,15 +826,11 @@ def render_video_selection():
         
         col1, col2 = st.columns([3, 1])
         with col2:
-            extract_button = st.button("Extract Questions", use_container_width=True)
+            extract_button = st.button("Extract Questions", on_click=start_direct_extraction, use_container_width=True)
             
-        # Process URL when button is clicked
-        if extract_button:
-            if not youtube_url:
-                st.error("Please enter a YouTube URL")
-            else:
-                st.session_state["youtube_url"] = youtube_url
-                go_to_extract_questions()
+        # Navigation happens in the on_click callback; only the empty-URL error is left here
+        if extract_button and not youtube_url:
+            st.error("Please enter a YouTube URL")
     
     # Original custom Video URL Input
     with st.expander("Process with backend (full features)", expanded=False):
@@ -760,60 +885,75 @@ def render_video_selection():
     # Navigation
     st.button("Back to Home", on_click=go_to_home)
 
+# Add a precomputed video link to each extracted question or conversation
+def add_timestamp_urls(content, video_id):
+    """
+    Store a "timestamp_url" on each extracted item, so rendering doesn't
+    rebuild the link on every rerun
+    
+    Parameters:
+        content (dict): Extracted content (questions or conversations); updated in place
+        video_id (str): ID of the video the content came from, or None for no links
+    """
+    if content["type"] == "questions":
+        for question in content["questions"]:
+            # Use timestamp if available, otherwise use segment_start
+            start_time = question["timestamp"] if "timestamp" in question else question["segment_start"]
+            question["timestamp_url"] = YOUTUBE_TIMESTAMP_URL.format(video_id=video_id, seconds=int(start_time)) if video_id else None
+    else:
+        for conversation in content["conversations"]:
+            # Use the timestamp if available, otherwise use start_time
+            start_time = conversation.get('timestamp', conversation.get('start_time', 0))
+            conversation["timestamp_url"] = YOUTUBE_TIMESTAMP_URL.format(video_id=video_id, seconds=int(start_time)) if video_id else None
+
 # Render the question extraction page
 def render_extract_questions():
     """Render the question extraction page"""
     st.title("YouTube動画から質問・会話を抽出 (Extract Questions/Conversations from YouTube)")
     
-    if "youtube_url" not in st.session_state:
-        st.session_state["youtube_url"] = ""
-        
-    if "extracted_content" not in st.session_state:
-        st.session_state["extracted_content"] = None
-    
-    # Form for URL input
-    st.write("### 日本語YouTubeのURLを入力 (Enter a Japanese YouTube URL)")
-    youtube_url = st.text_input(
-        "日本語 YouTube URL", 
-        value=st.session_state.get("youtube_url", ""), 
-        key="youtube_url_input",
-        help="例: https://www.youtube.com/watch?v=2aqVJS6QOoY"
-    )
-    
-    # Method selection
-    st.write("### 抽出方法を選択 (Select Extraction Method)")
-    
-    extraction_methods = [
-        "字幕から抽出 (Extract from Captions)",
-        "AI抽出 (Whisper + Ollama)"
-    ]
+    # Read once; it doesn't change while the page renders
+    ollama_available = st.session_state.get("ollama_available", False)
     
-    # Default to AI method if Ollama is available, otherwise use captions method
-    default_method_idx = 1 if st.session_state.get("ollama_available", False) else 0
-    
-    # Check if we already have a selected method in the session state
-    if "extraction_method" not in st.session_state:
-        st.session_state["extraction_method"] = extraction_methods[default_method_idx]
-    
-    # Display method selection
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        method = st.radio(
-            "抽出方法 (Extraction Method)",
-            extraction_methods,
-            index=extraction_methods.index(st.session_state["extraction_method"]),
-            horizontal=True
+    # Form for URL input and method, so nothing reruns until it is submitted
+    with st.form("extract_form"):
+        st.write("### 日本語YouTubeのURLを入力 (Enter a Japanese YouTube URL)")
+        youtube_url = st.text_input(
+            "日本語 YouTube URL", 
+            value=st.session_state.get("youtube_url", ""), 
+            key="youtube_url_input",
+            help="例: https://www.youtube.com/watch?v=2aqVJS6QOoY"
         )
-        st.session_state["extraction_method"] = method
-    
-    # Extract button
-    with col2:
-        extract_btn = st.button("質問・会話を抽出する (Extract Questions/Conversations)", key="extract_btn", use_container_width=True)
+        
+        # Method selection
+        st.write("### 抽出方法を選択 (Select Extraction Method)")
+        
+        # Default to AI method if Ollama is available, otherwise use captions method
+        default_method_idx = 1 if ollama_available else 0
+        
+        # Keep the selected method from earlier in the session, if any
+        st.session_state.setdefault("extraction_method", EXTRACTION_METHODS[default_method_idx])
+        
+        # Display method selection
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            method = st.radio(
+                "抽出方法 (Extraction Method)",
+                EXTRACTION_METHODS,
+                index=EXTRACTION_METHODS.index(st.session_state["extraction_method"]),
+                horizontal=True
+            )
+            st.session_state["extraction_method"] = method
+        
+        # Extract button
+        with col2:
+            extract_btn = st.form_submit_button("質問・会話を抽出する (Extract Questions/Conversations)", use_container_width=True)
+        
+        force_reextract = st.checkbox("再抽出する (Force re-extract)", help="保存された結果を使わずに抽出し直します (Ignore cached results and extract again)")
     
     # Display help for methods - removed as per user request
     
     # Check if Ollama is available for AI method
-    if method == "AI抽出 (Whisper + Ollama)" and not st.session_state.get("ollama_available", False):
+    if method == "AI抽出 (Whisper + Ollama)" and not ollama_available:
         st.warning("""
         ⚠️ AI抽出にはOllamaが必要です。Ollamaが実行されていません。
         
@@ -825,27 +965,40 @@ def render_extract_questions():
     if extract_btn:
         if not youtube_url:
             st.error("YouTubeのURLを入力してください。(Please enter a YouTube URL.)")
+        elif (
+            not force_reextract
+            and st.session_state.get("extracted_content")
+            and st.session_state.get("_last_extraction") == (youtube_url, method)
+        ):
+            # Same URL and method as the results already shown; don't extract again
+            st.info("この動画はすでに抽出済みです。(This video has already been extracted.)")
         else:
+            # Parse the video ID once per URL; the display code below reuses it on every rerun
             st.session_state["youtube_url"] = youtube_url
+            st.session_state["youtube_video_id"] = extract_youtube_id(youtube_url)
             with st.spinner("動画から質問・会話を抽出しています... (Extracting content from video...)"):
                 try:
+                    if force_reextract:
+                        _cached_extract_from_captions.clear()
+                    
                     # Use the selected method
                     if method == "AI抽出 (Whisper + Ollama)":
-                        if st.session_state.get("ollama_available", False):
+                        if ollama_available:
                             result = extract_questions_with_ai(youtube_url)
                         else:
                             st.error("Ollama が利用できないため、AI抽出を使用できません。字幕からの抽出を使用します。")
-                            result = extract_questions_from_youtube(youtube_url)
+                            result = extract_from_captions(youtube_url)
                     else:
-                        result = extract_questions_from_youtube(youtube_url)
+                        result = extract_from_captions(youtube_url)
                         
                     if result:
+                        add_timestamp_urls(result, st.session_state["youtube_video_id"])
                         st.session_state["extracted_content"] = result
+                        st.session_state["_last_extraction"] = (youtube_url, method)
                         if result["type"] == "questions":
                             st.success(f"✅ 成功! {len(result['questions'])}個の質問を抽出しました (Successfully extracted {len(result['questions'])} questions)")
                         else:
                             st.success(f"✅ 成功! {len(result['conversations'])}個の会話を抽出しました (Successfully extracted {len(result['conversations'])} conversations)")
-                        st.rerun()  # Refresh to display the content
                     else:
                         st.error("この動画から質問を抽出できませんでした。他の動画を試してください。(Could not extract any questions from this video.)")
                 except Exception as e:
@@ -853,15 +1006,14 @@ def render_extract_questions():
                     st.exception(e)
                     st.info("別の動画を試すか、インターネット接続を確認してください。(Try a different video URL or check your internet connection.)")
     
-    # Display the video if we have content
-    if st.session_state.get("extracted_content") and st.session_state.get("youtube_url"):
-        video_id = extract_youtube_id(st.session_state["youtube_url"])
-        if video_id:
-            st.video(f"https://www.youtube.com/watch?v={video_id}")
+    # Read after the extraction above, which may have just replaced them
+    content = st.session_state.get("extracted_content")
+    video_id = st.session_state.get("youtube_video_id")
     
-    # Display content if we have it
-    if st.session_state.get("extracted_content"):
-        content = st.session_state["extracted_content"]
+    # Display the video and content if we have it
+    if content:
+        if video_id:
+            st.video(YOUTUBE_WATCH_URL.format(video_id=video_id))
         
         if content["type"] == "questions":
             # Display questions
@@ -871,32 +1023,24 @@ def render_extract_questions():
             
             for i, question in enumerate(questions):
                 with st.expander(f"質問 {i+1}: {question['question_text'][:30]}...", expanded=True):
-                    # Display content type badge
-                    st.markdown(f"**{question.get('content_type', '質問 (Question)')}**")
-                    
-                    # Display the full question
-                    st.subheader(f"{question['question_text']}")
-                    
-                    # Display context
-                    st.markdown("### 会話の文脈 (Conversation Context)")
+                    # Content type badge, full question and context, as one markdown block
+                    parts = [
+                        f"**{question.get('content_type', '質問 (Question)')}**",
+                        f"### {question['question_text']}",
+                        "### 会話の文脈 (Conversation Context)"
+                    ]
                     
                     if question.get("context_before"):
-                        st.markdown("**前 (Before):**")
-                        st.markdown(f"*{question['context_before']}*")
+                        parts += ["**前 (Before):**", f"*{question['context_before']}*"]
                     
                     if question.get("context_after"):
-                        st.markdown("**後 (After):**")
-                        st.markdown(f"*{question['context_after']}*")
+                        parts += ["**後 (After):**", f"*{question['context_after']}*"]
                     
                     # Add timestamp link
-                    video_id = extract_youtube_id(st.session_state["youtube_url"])
-                    if video_id:
-                        # Use timestamp if available, otherwise use segment_start
-                        if "timestamp" in question:
-                            start_time = int(question["timestamp"])
-                        else:
-                            start_time = int(question["segment_start"])
-                        st.markdown(f"[この質問を動画で見る (Watch this question in the video)](https://www.youtube.com/watch?v={video_id}&t={start_time}s)")
+                    if question.get("timestamp_url"):
+                        parts.append(f"[この質問を動画で見る (Watch this question in the video)]({question['timestamp_url']})")
+                    
+                    st.markdown("\n\n".join(parts))
         else:
             # Display conversations
             conversations = content["conversations"]
@@ -907,22 +1051,19 @@ def render_extract_questions():
                 # Prepare a preview of the conversation (first ~30 chars)
                 preview = conversation['text'][:30] + "..." if len(conversation['text']) > 30 else conversation['text']
                 
-                # Use the timestamp for linking to the video if available, otherwise use start_time
-                timestamp = conversation.get('timestamp', conversation.get('start_time', 0))
-                
                 with st.expander(f"会話 {i+1}: {preview}", expanded=True):
-                    # Display content type badge
-                    st.markdown(f"**{conversation.get('content_type', '会話 (Conversation)')}**")
-                    
-                    # Display the conversation
-                    st.markdown("### 会話内容 (Conversation Content)")
-                    st.markdown(f"*{conversation['text']}*")
+                    # Content type badge and the conversation, as one markdown block
+                    parts = [
+                        f"**{conversation.get('content_type', '会話 (Conversation)')}**",
+                        "### 会話内容 (Conversation Content)",
+                        f"*{conversation['text']}*"
+                    ]
                     
                     # Add timestamp link
-                    video_id = extract_youtube_id(st.session_state["youtube_url"])
-                    if video_id:
-                        start_time = int(timestamp)
-                        st.markdown(f"[この会話を動画で見る (Watch this conversation in the video)](https://www.youtube.com/watch?v={video_id}&t={start_time}s)")
+                    if conversation.get("timestamp_url"):
+                        parts.append(f"[この会話を動画で見る (Watch this conversation in the video)]({conversation['timestamp_url']})")
+                    
+                    st.markdown("\n\n".join(parts))
                         
                     # Add additional metadata if available
                     if 'start_time' in conversation and 'end_time' in conversation:
@@ -933,17 +1074,9 @@ def render_extract_questions():
     # Navigation buttons
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("ホームに戻る (Return to Home)", use_container_width=True):
-            # Clear extraction results
-            if "extracted_content" in st.session_state:
-                del st.session_state["extracted_content"]
-            go_to_home()
+        st.button("ホームに戻る (Return to Home)", on_click=leave_extraction, args=(go_to_home,), use_container_width=True)
     with col2:
-        if st.button("別の動画を選ぶ (Select Another Video)", use_container_width=True):
-            # Clear extraction results
-            if "extracted_content" in st.session_state:
-                del st.session_state["extracted_content"]
-            go_to_video_selection()
+        st.button("別の動画を選ぶ (Select Another Video)", on_click=leave_extraction, args=(go_to_video_selection,), use_container_width=True)
 
 # Extract questions using Whisper + Llama
 def extract_questions_with_ai(video_url):
@@ -976,16 +1109,12 @@ def extract_questions_with_ai(video_url):
             try:
                 # Check if yt-dlp is installed
                 try:
-                    import subprocess
                     subprocess.run(["yt-dlp", "--version"], capture_output=True, check=True)
                 except (FileNotFoundError, subprocess.CalledProcessError):
                     st.error("yt-dlp がインストールされていません。`pip install yt-dlp` を実行してください。(yt-dlp is not installed. Please run `pip install yt-dlp`.)")
                     return None
                 
                 # Create a temporary directory for downloaded files
-                import tempfile
-                import os
-                
                 temp_dir = tempfile.mkdtemp()
                 audio_file = os.path.join(temp_dir, f"{video_id}.mp3")
                 
@@ -995,7 +1124,7 @@ def extract_questions_with_ai(video_url):
                     "-x", "--audio-format", "mp3", 
                     "--audio-quality", "0",
                     "-o", audio_file,
-                    f"https://www.youtube.com/watch?v={video_id}"
+                    YOUTUBE_WATCH_URL.format(video_id=video_id)
                 ]
                 
                 process = subprocess.run(cmd, capture_output=True, text=True)
@@ -1127,8 +1256,8 @@ def extract_questions_with_ai(video_url):
                     st.warning(f"文字起こしが長すぎるため、最初の{len(truncated_transcript)}文字のみを分析します。(Transcript is too long, analyzing only the first {len(truncated_transcript)} characters.)")
                 
                 # Call Ollama with the transcript
-                response = requests.post(
-                    "http://localhost:11434/api/generate",
+                response = OLLAMA_SESSION.post(
+                    f"{OLLAMA_URL}/api/generate",
                     json={
                         "model": model,
                         "prompt": transcript,
@@ -1136,7 +1265,7 @@ def extract_questions_with_ai(video_url):
                         "stream": False,
                         "format": "json"
                     },
-                    timeout=60  # Increased timeout for longer processing
+                    timeout=get_ollama_timeout()
                 )
                 
                 if response.status_code != 200:
@@ -1147,7 +1276,6 @@ def extract_questions_with_ai(video_url):
                 ai_response = result.get('response', '')
                 
                 # Try to parse the JSON from the response
-                import json
                 try:
                     # Find JSON in the response
                     json_start = ai_response.find('{')
@@ -1222,7 +1350,6 @@ def extract_questions_with_ai(video_url):
             
         # Clean up
         try:
-            import shutil
             shutil.rmtree(temp_dir)
         except:
             pass
@@ -1232,6 +1359,13 @@ def extract_questions_with_ai(video_url):
         st.exception(e)
         return None
 
+# Page renderer for each app state; additional pages can be added here as they are implemented
+PAGE_RENDERERS = {
+    APP_STATES["HOME"]: render_home,
+    APP_STATES["VIDEO_SELECTION"]: render_video_selection,
+    APP_STATE_EXTRACT_QUESTIONS: render_extract_questions,
+}
+
 # Main app function
 def main():
     """Main application function"""
@@ -1247,30 +1381,32 @@ def main():
         # Initialize session state
         initialize_session_state()
             
-        # Check if backend is running
-        backend_url = find_backend_server()
-        st.session_state["backend_available"] = backend_url is not None
-        st.session_state["backend_url"] = backend_url
+        # Check if backend is running and if Ollama is available (Ollama once
+        # per session; the sidebar has a retry button). The two probes are
+        # independent network calls, so run them at the same time; only the
+        # results are written to session state, here on the script thread.
+        backend_future = ollama_future = None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if backend_discovery_due():
+                backend_future = executor.submit(find_backend_server)
+            if not st.session_state.get("ollama_checked", False):
+                ollama_future = executor.submit(probe_ollama)
         
-        # Check if Ollama is available
-        if "ollama_available" not in st.session_state:
-            check_ollama_availability()
+        if backend_future is not None:
+            store_backend_url(backend_future.result())
+        if ollama_future is not None:
+            check_ollama_availability(ollama_future.result())
         
         # Clear the startup placeholder once initialization is complete
         startup_placeholder.empty()
         
         # Render the appropriate page based on app_state
-        if st.session_state["app_state"] == APP_STATES["HOME"]:
-            render_home()
-        elif st.session_state["app_state"] == APP_STATES["VIDEO_SELECTION"]:
-            render_video_selection()
-        elif st.session_state["app_state"] == APP_STATE_EXTRACT_QUESTIONS:
-            render_extract_questions()
-        # Additional pages can be added here as they are implemented
-        else:
+        renderer = PAGE_RENDERERS.get(st.session_state["app_state"])
+        if renderer is None:
             # For now, any other state will default to home
             st.session_state["app_state"] = APP_STATES["HOME"]
-            render_home()
+            renderer = render_home
+        renderer()
             
     except Exception as e:
         # Provide a friendly error message and recovery options
@@ -1278,6 +1414,8 @@ def main():
         
         # Show detailed error in an expander for debugging
         with st.expander("Error Details", expanded=False):
+            # Only needed when something has gone wrong, so imported here
+            import traceback
             st.code(traceback.format_exc())
             
         # Offer recovery options
@@ -1301,21 +1439,11 @@ def main():
             # Display model selection
             current_model = st.session_state.get("ollama_model", "llama3.2:1b")
             
-            # Standard models that might be available
-            standard_models = ["llama3.2:1b", "llama3", "mistral", "gemma", "codellama", "phi3", "wizardcoder", "solar", "qwen"]
-            
-            # Try to get available models from Ollama
-            available_models = []
-            try:
-                response = requests.get("http://localhost:11434/api/tags", timeout=1)
-                if response.status_code == 200:
-                    models_data = response.json()
-                    available_models = [model["name"] for model in models_data.get("models", [])]
-            except:
-                pass
+            # Models Ollama reported when it was last checked
+            available_models = st.session_state.get("ollama_models", [])
             
             # Combine standard models with any discovered models
-            model_options = list(set(standard_models + available_models))
+            model_options = list(set(STANDARD_OLLAMA_MODELS).union(available_models))
             
             # If current model isn't in the list, add it
             if current_model not in model_options:
@@ -1332,21 +1460,33 @@ def main():
             if model != st.session_state.get("ollama_model"):
                 st.session_state["ollama_model"] = model
                 st.info(f"Model changed to {model}. This will be used for translations.")
+            
+            # How long to wait for the model before giving up. The value lives in a
+            # plain session key, so it survives reruns where the sidebar widget isn't shown.
+            st.session_state["ollama_timeout"] = st.number_input(
+                "Ollama timeout (s)",
+                min_value=OLLAMA_MIN_TIMEOUT,
+                max_value=OLLAMA_MAX_TIMEOUT,
+                value=float(st.session_state["ollama_timeout"]),
+                step=10.0,
+                key="ollama_timeout_input",
+                help="Local models can be slow to start answering; set OLLAMA_REQUEST_TIMEOUT_S to change the default."
+            )
                 
             # Show a button to test the model
             if st.button("Test Translation"):
                 with st.spinner("Testing model..."):
                     try:
                         test_text = "こんにちは、元気ですか？"
-                        response = requests.post(
-                            "http://localhost:11434/api/generate",
+                        response = OLLAMA_SESSION.post(
+                            f"{OLLAMA_URL}/api/generate",
                             json={
                                 "model": model,
                                 "prompt": f"Translate this Japanese text to English: {test_text}",
                                 "system": "You are a translator that translates Japanese to English.",
                                 "stream": False
                             },
-                            timeout=5
+                            timeout=get_ollama_timeout()
                         )
                         if response.status_code == 200:
                             translation = response.json().get('response', '').strip()
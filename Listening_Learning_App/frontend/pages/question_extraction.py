@@ -2,146 +2,236 @@
 Question extraction page module for the Listening Learning App frontend
 """
 
+import hashlib
+import time
 import streamlit as st
-from Listening_Learning_App.frontend.processors.question_extractor import extract_questions_from_youtube
-from Listening_Learning_App.frontend.processors.youtube import extract_youtube_id
-from Listening_Learning_App.frontend.utils.session import go_to_home, go_to_video_selection
+from Listening_Learning_App.frontend.processors.question_extractor import extract_questions_from_youtube, translate_questions, translate_texts, json_loads
+from Listening_Learning_App.frontend.processors.youtube import add_timestamp_urls, extract_youtube_id
+from Listening_Learning_App.frontend.utils.youtube_urls import YOUTUBE_WATCH_URL
+from Listening_Learning_App.frontend.utils.network import OLLAMA_SESSION, OLLAMA_URL, get_ollama_timeout
+from Listening_Learning_App.frontend.utils.session import go_to_home, go_to_video_selection, leave_extraction
+
+# Seconds between redraws while a streamed translation comes in
+STREAM_REDRAW_INTERVAL = 0.1
+
+def translation_key(text, model):
+    """
+    Get a short stable key for a translation of text by model
+    
+    Parameters:
+        text (str): Japanese text
+        model (str): Ollama model name
+    
+    Returns:
+        str: Hex digest identifying the translation
+    """
+    return hashlib.blake2b(f"{model}\0{text}".encode(), digest_size=8).hexdigest()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_extract(video_url):
+    """
+    Extract questions from a YouTube video, cached for an hour
+    
+    Only the transcript fetch and extraction are cached; they don't depend on
+    the session. Translation depends on the session's Ollama settings, so it
+    runs after this, outside the cache.
+    
+    Parameters:
+        video_url (str): YouTube URL
+    
+    Returns:
+        dict: Dictionary with extracted content (untranslated)
+    
+    Raises:
+        ValueError: If nothing could be extracted; raising keeps the failure out of the cache
+    """
+    result = extract_questions_from_youtube(video_url)
+    if not result:
+        raise ValueError(f"No questions or conversations found for {video_url}")
+    return result
+
+def _render_extracted_content(content, video_id):
+    """
+    Render the video and the extracted questions/conversations
+    
+    Parameters:
+        content (dict): Extracted content (questions or conversations)
+        video_id (str): ID of the video the content was extracted from, or None
+    """
+    # Display the video if we have an ID
+    if video_id:
+        st.video(YOUTUBE_WATCH_URL.format(video_id=video_id))
+    
+    if content["type"] == "questions":
+        # Display questions
+        questions = content["questions"]
+        
+        st.markdown("## 動画から抽出された質問 (Questions Extracted from Video)")
+        
+        for i, question in enumerate(questions):
+            with st.expander(f"質問 {i+1}", expanded=True):
+                # Question, translation and context, as one markdown block
+                parts = [f"### {question['question_text']}"]
+                
+                # Display English translation if available
+                if question.get("english_translation"):
+                    parts.append(f"> English: {question['english_translation']}")
+                
+                parts.append("### 会話の文脈 (Conversation Context)")
+                
+                if question.get("context_before"):
+                    parts += ["**前 (Before):**", f"*{question['context_before']}*"]
+                
+                if question.get("context_after"):
+                    parts += ["**後 (After):**", f"*{question['context_after']}*"]
+                
+                # Add timestamp link
+                if question.get("timestamp_url"):
+                    parts.append(f"[この質問を動画で見る (Watch this question in the video)]({question['timestamp_url']})")
+                
+                st.markdown("\n\n".join(parts))
+    else:
+        # Display conversations
+        conversations = content["conversations"]
+        
+        st.markdown("## 動画から抽出された会話 (Conversations Extracted from Video)")
+        
+        # Translations kept for this session, keyed by translation_key()
+        model = st.session_state.get("ollama_model", "mistral")
+        saved_translations = st.session_state.setdefault("translations", {})
+        keys = [translation_key(conversation["text"], model) for conversation in conversations]
+        
+        # Translate every conversation not yet translated, at once, if Ollama is available
+        if st.session_state.get("ollama_available", False):
+            if st.button("すべて翻訳する (Translate All)", key="translate_all"):
+                missing = [(key, conversation["text"]) for key, conversation in zip(keys, conversations) if key not in saved_translations]
+                with st.spinner("翻訳中... (Translating...)"):
+                    translations = translate_texts([text for _, text in missing], model)
+                for (key, _), translation in zip(missing, translations):
+                    if translation:
+                        saved_translations[key] = translation
+        
+        # Content keys that already have a Translate button; a repeated text shares the first one
+        button_keys = set()
+        
+        for i, (key, conversation) in enumerate(zip(keys, conversations)):
+            with st.expander(f"会話 {i+1}", expanded=True):
+                # Conversation text and timestamp link, as one markdown block
+                parts = ["### 会話内容 (Conversation)", f"*{conversation['text']}*"]
+                if conversation.get("timestamp_url"):
+                    parts.append(f"[この会話を動画で見る (Watch this conversation in the video)]({conversation['timestamp_url']})")
+                if key in saved_translations:
+                    parts.append(f"### 英語訳 (English Translation)\n\n*{saved_translations[key]}*")
+                st.markdown("\n\n".join(parts))
+                
+                # Try to translate if Ollama is available and it isn't translated yet.
+                # The button is keyed by content, so it keeps its identity if the list changes.
+                if key not in saved_translations and key not in button_keys and st.session_state.get("ollama_available", False):
+                    button_keys.add(key)
+                    if st.button(f"翻訳する (Translate)", key=f"translate_{key}"):
+                        try:
+                            # Show the translation as it is generated instead of after the whole reply
+                            placeholder = st.empty()
+                            placeholder.info("翻訳中... (Translating...)")
+                            with OLLAMA_SESSION.post(
+                                f"{OLLAMA_URL}/api/generate",
+                                json={
+                                    "model": model,
+                                    "prompt": f"Translate this Japanese text to English: {conversation['text']}",
+                                    "stream": True,
+                                },
+                                stream=True,
+                                timeout=get_ollama_timeout()
+                            ) as response:
+                                if response.status_code == 200:
+                                    translation = ""
+                                    last_redraw = 0.0
+                                    for line in response.iter_lines():
+                                        if not line:
+                                            continue
+                                        chunk = json_loads(line)
+                                        translation += chunk.get('response', '')
+                                        now = time.monotonic()
+                                        if now - last_redraw >= STREAM_REDRAW_INTERVAL:
+                                            placeholder.markdown(f"### 英語訳 (English Translation)\n\n*{translation}*")
+                                            last_redraw = now
+                                    placeholder.markdown(f"### 英語訳 (English Translation)\n\n*{translation}*")
+                                    saved_translations[key] = translation
+                                else:
+                                    placeholder.empty()
+                        except Exception as e:
+                            st.error(f"翻訳エラー: {str(e)} (Translation error)")
 
 def render_extract_questions():
     """Render the question extraction page"""
     st.title("Extract Questions from YouTube")
     
-    if "youtube_url" not in st.session_state:
-        st.session_state["youtube_url"] = ""
+    # Form for URL input, so typing doesn't rerun the page until it is submitted
+    with st.form("extract_form"):
+        st.write("### Enter a Japanese YouTube URL")
+        youtube_url = st.text_input(
+            "日本語 YouTube URL (Japanese YouTube URL)", 
+            value=st.session_state.get("youtube_url", ""), 
+            key="youtube_url_input",
+            help="例: https://www.youtube.com/watch?v=2aqVJS6QOoY"
+        )
         
-    if "extracted_content" not in st.session_state:
-        st.session_state["extracted_content"] = None
-    
-    # Form for URL input
-    st.write("### Enter a Japanese YouTube URL")
-    youtube_url = st.text_input(
-        "日本語 YouTube URL (Japanese YouTube URL)", 
-        value=st.session_state.get("youtube_url", ""), 
-        key="youtube_url_input",
-        help="例: https://www.youtube.com/watch?v=2aqVJS6QOoY"
-    )
-    
-    # Extract button
-    col1, col2 = st.columns([3, 1])
-    with col2:
-        extract_btn = st.button("質問を抽出する (Extract Questions)", key="extract_btn", use_container_width=True)
+        # Extract button
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            extract_btn = st.form_submit_button("質問を抽出する (Extract Questions)", use_container_width=True)
+        
+        force_reextract = st.checkbox("再抽出する (Force re-extract)", help="保存された結果を使わずに抽出し直します (Ignore cached results and extract again)")
     
     if extract_btn:
         if not youtube_url:
             st.error("YouTubeのURLを入力してください (Please enter a YouTube URL)")
+        elif (
+            not force_reextract
+            and st.session_state.get("extracted_content")
+            and st.session_state.get("_last_extracted_url") == youtube_url
+        ):
+            # Same URL as the results already shown; don't extract again
+            st.info("この動画はすでに抽出済みです。(This video has already been extracted.)")
         else:
+            # Parse the video ID once per URL; reruns reuse it
             st.session_state["youtube_url"] = youtube_url
+            st.session_state["youtube_video_id"] = extract_youtube_id(youtube_url)
             with st.spinner("動画から質問を抽出しています... (Extracting questions from video...)"):
                 try:
-                    result = extract_questions_from_youtube(youtube_url)
+                    if force_reextract:
+                        _cached_extract.clear()
+                    try:
+                        result = _cached_extract(youtube_url)
+                    except ValueError:
+                        result = None
+                    
+                    # Translate with this session's Ollama settings
+                    if result and result["type"] == "questions" and st.session_state.get("ollama_available", False):
+                        translate_questions(result["questions"], st.session_state.get("ollama_model", "mistral"))
+                    
                     if result:
+                        add_timestamp_urls(result, st.session_state["youtube_video_id"])
                         st.session_state["extracted_content"] = result
+                        st.session_state["_last_extracted_url"] = youtube_url
                         if result["type"] == "questions":
                             st.success(f"✅ 成功! {len(result['questions'])}個の質問を抽出しました (Successfully extracted {len(result['questions'])} questions)")
                         else:
                             st.success(f"✅ 成功! {len(result['conversations'])}個の会話を抽出しました (Successfully extracted {len(result['conversations'])} conversations)")
-                        st.rerun()  # Refresh to display the content
                     else:
                         st.error("この動画から質問を抽出できませんでした。他の動画を試してください。(Could not extract any questions from this video.)")
                 except Exception as e:
                     st.error(f"エラー: {str(e)} (Error processing video)")
                     st.info("別の動画を試すか、インターネット接続を確認してください。(Try a different video URL or check your internet connection.)")
     
-    # Display the video if we have content
-    if st.session_state.get("extracted_content") and st.session_state.get("youtube_url"):
-        video_id = extract_youtube_id(st.session_state["youtube_url"])
-        if video_id:
-            st.video(f"https://www.youtube.com/watch?v={video_id}")
-    
     # Display content if we have it
-    if st.session_state.get("extracted_content"):
-        content = st.session_state["extracted_content"]
-        
-        if content["type"] == "questions":
-            # Display questions
-            questions = content["questions"]
-            
-            st.markdown("## 動画から抽出された質問 (Questions Extracted from Video)")
-            
-            for i, question in enumerate(questions):
-                with st.expander(f"質問 {i+1}", expanded=True):
-                    st.subheader(f"{question['question_text']}")
-                    
-                    # Display English translation if available
-                    if question.get("english_translation"):
-                        st.info(f"English: {question['english_translation']}")
-                    
-                    # Display context
-                    st.markdown("### 会話の文脈 (Conversation Context)")
-                    
-                    if question.get("context_before"):
-                        st.markdown("**前 (Before):**")
-                        st.markdown(f"*{question['context_before']}*")
-                    
-                    if question.get("context_after"):
-                        st.markdown("**後 (After):**")
-                        st.markdown(f"*{question['context_after']}*")
-                    
-                    # Add timestamp link
-                    video_id = extract_youtube_id(st.session_state["youtube_url"])
-                    if video_id:
-                        start_time = int(question["segment_start"])
-                        st.markdown(f"[この質問を動画で見る (Watch this question in the video)](https://www.youtube.com/watch?v={video_id}&t={start_time}s)")
-        else:
-            # Display conversations
-            conversations = content["conversations"]
-            
-            st.markdown("## 動画から抽出された会話 (Conversations Extracted from Video)")
-            
-            for i, conversation in enumerate(conversations):
-                with st.expander(f"会話 {i+1}", expanded=True):
-                    st.markdown("### 会話内容 (Conversation)")
-                    st.markdown(f"*{conversation['text']}*")
-                    
-                    # Try to translate if Ollama is available
-                    if st.session_state.get("ollama_available", False):
-                        if st.button(f"翻訳する (Translate)", key=f"translate_{i}"):
-                            try:
-                                import requests
-                                with st.spinner("翻訳中... (Translating...)"):
-                                    response = requests.post(
-                                        "http://localhost:11434/api/generate",
-                                        json={
-                                            "model": st.session_state.get("ollama_model", "mistral"),
-                                            "prompt": f"Translate this Japanese text to English: {conversation['text']}",
-                                        },
-                                        stream=False,
-                                        timeout=10
-                                    )
-                                    if response.status_code == 200:
-                                        translation = response.json().get('response', '')
-                                        st.markdown("### 英語訳 (English Translation)")
-                                        st.markdown(f"*{translation}*")
-                            except Exception as e:
-                                st.error(f"翻訳エラー: {str(e)} (Translation error)")
-                    
-                    # Add timestamp link
-                    video_id = extract_youtube_id(st.session_state["youtube_url"])
-                    if video_id:
-                        start_time = int(conversation["start_time"])
-                        st.markdown(f"[この会話を動画で見る (Watch this conversation in the video)](https://www.youtube.com/watch?v={video_id}&t={start_time}s)")
+    content = st.session_state.get("extracted_content")
+    if content:
+        _render_extracted_content(content, st.session_state.get("youtube_video_id"))
     
     # Navigation buttons
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("ホームに戻る (Return to Home)", use_container_width=True):
-            # Clear extraction results
-            if "extracted_content" in st.session_state:
-                del st.session_state["extracted_content"]
-            go_to_home()
+        st.button("ホームに戻る (Return to Home)", on_click=leave_extraction, args=(go_to_home,), use_container_width=True)
     with col2:
-        if st.button("別の動画を選ぶ (Select Another Video)", use_container_width=True):
-            # Clear extraction results
-            if "extracted_content" in st.session_state:
-                del st.session_state["extracted_content"]
-            go_to_video_selection() 
\ No newline at end of file
+        st.button("別の動画を選ぶ (Select Another Video)", on_click=leave_extraction, args=(go_to_video_selection,), use_container_width=True) 
\ No newline at end of file
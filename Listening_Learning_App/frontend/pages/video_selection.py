@@ -4,7 +4,7 @@ Video selection page module for the Listening Learning App frontend
 
 import streamlit as st
 from Listening_Learning_App.frontend.processors.youtube import extract_youtube_id, process_custom_video
-from Listening_Learning_App.frontend.utils.session import go_to_home, go_to_processing_video, go_to_extract_questions
+from Listening_Learning_App.frontend.utils.session import go_to_home, go_to_processing_video, start_direct_extraction
 
 def render_video_selection():
     """Render the video selection page with YouTube URL input and saved videos"""
@@ -36,15 +36,11 @@ def render_video_selection():
         
         col1, col2 = st.columns([3, 1])
         with col2:
-            extract_button = st.button("Extract Questions", use_container_width=True)
+            extract_button = st.button("Extract Questions", on_click=start_direct_extraction, use_container_width=True)
             
-        # Process URL when button is clicked
-        if extract_button:
-            if not youtube_url:
-                st.error("Please enter a YouTube URL")
-            else:
-                st.session_state["youtube_url"] = youtube_url
-                go_to_extract_questions()
+        # Navigation happens in the on_click callback; only the empty-URL error is left here
+        if extract_button and not youtube_url:
+            st.error("Please enter a YouTube URL")
     
     # Original custom Video URL Input
     with st.expander("Process with backend (full features)", expanded=False):
@@ -3,15 +3,48 @@ Question extraction module for YouTube videos
 """
 
 import re
-import streamlit as st
+import bisect
+import json
+import numpy as np
 import requests
+import streamlit as st
 import logging
-from youtube_transcript_api import YouTubeTranscriptApi
+from concurrent.futures import ThreadPoolExecutor
+
+# Parse Ollama replies with orjson when it is installed; it is optional and
+# several times faster than the standard library parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 from Listening_Learning_App.frontend.processors.youtube import extract_youtube_id
+from Listening_Learning_App.frontend.utils.network import OLLAMA_SESSION, OLLAMA_URL, get_ollama_timeout
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Japanese question detection patterns, compiled once at import. Each one is
+# scanned separately: a single alternation would stop at the first alternative
+# that matches at each position and miss the overlapping matches the others find.
+QUESTION_PATTERNS = (
+    # Questions ending with ka (か) and question mark
+    re.compile(r'([^。？！]*[か][？])'),
+    # Questions ending with ka (か) and period
+    re.compile(r'([^。？！]*[か][。])'),
+    # Questions ending with a question mark
+    re.compile(r'([^。？！]*[？])'),
+    # Polite questions
+    re.compile(r'([^。？！]*(?:ですか|ますか|のですか|のでしょうか)[？。]?)'),
+    # Questions with interrogatives
+    re.compile(r'([^。？！]*(?:何|なに|どう|なぜ|どこ|誰|だれ|いつ|どんな|どの)[^。？！]*[か][？。]?)')
+)
+
+# One line of a numbered list, e.g. "3. Where are you going?"
+NUMBERED_LINE_PATTERN = re.compile(r'^\s*(\d+)[.)]\s*(.+)$', re.MULTILINE)
+
+# Most translation requests to send to Ollama at once
+MAX_PARALLEL_TRANSLATIONS = 4
+
 def extract_questions_from_youtube(video_url):
     """
     Extract questions from a YouTube video transcript
@@ -34,24 +67,30 @@ def extract_questions_from_youtube(video_url):
         st.info(f"処理中のビデオID: {video_id} (Processing video ID: {video_id})")
         
         # Get transcript using youtube_transcript_api (open source)
+        # Imported here so pages that never fetch transcripts don't pay for it
+        from youtube_transcript_api import YouTubeTranscriptApi
+        # List the video's transcripts once, then pick from that list locally
         try:
-            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['ja', 'ja-JP'])
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        except Exception as e:
+            st.error(f"いずれの字幕も取得できませんでした: {str(e)} (Failed to get any transcript)")
+            st.error("このビデオに利用可能な字幕がありません。(No transcript available for this video.)")
+            return None
+        
+        try:
+            # Manually created Japanese captions are preferred over auto-generated ones
+            transcript = transcript_list.find_transcript(['ja', 'ja-JP']).fetch()
             st.success("日本語字幕を正常に取得しました！(Japanese transcript successfully retrieved!)")
         except Exception as e:
             st.error(f"日本語字幕の取得に失敗しました: {str(e)} (Failed to get Japanese transcript)")
             st.info("いずれかの利用可能な字幕を取得しようとしています... (Trying to get any available transcript...)")
             try:
-                transcript = YouTubeTranscriptApi.get_transcript(video_id)
+                transcript = next(iter(transcript_list)).fetch()
                 st.success("字幕を取得しました（非日本語）。(Transcript retrieved (non-Japanese).)")
             except Exception as e2:
                 st.error(f"いずれの字幕も取得できませんでした: {str(e2)} (Failed to get any transcript)")
-                # Try to get auto-generated transcript as last resort
-                try:
-                    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=['ja', 'en', 'auto'])
-                    st.success("自動生成された字幕を取得しました。(Auto-generated transcript retrieved.)")
-                except Exception as e3:
-                    st.error("このビデオに利用可能な字幕がありません。(No transcript available for this video.)")
-                    return None
+                st.error("このビデオに利用可能な字幕がありません。(No transcript available for this video.)")
+                return None
             
         # Format transcript for processing
         formatted_transcript = []
@@ -67,83 +106,56 @@ def extract_questions_from_youtube(video_url):
             st.write(f"取得した字幕セグメント: {len(formatted_transcript)}個 (Found {len(formatted_transcript)} transcript segments)")
             if len(formatted_transcript) > 0:
                 st.write("字幕の内容 (Transcript content):")
-                for segment in formatted_transcript:
-                    st.write(f"{segment['start']:.1f}s: {segment['text']}")
+                # One text element for all segments instead of one element per segment
+                st.text("\n".join(f"{segment['start']:.1f}s: {segment['text']}" for segment in formatted_transcript))
         
         # Extract ONLY REAL questions from the transcript (questions actually asked in the video)
         actual_questions = []
         
         # Combine all transcript text
         full_text = " ".join([segment["text"] for segment in formatted_transcript])
-        st.info(f"字幕内の文字数: {len(full_text)}文字 (Transcript length: {len(full_text)} characters)")
         
-        # Japanese question detection patterns
-        question_patterns = [
-            # Pattern for questions ending with ka (か) and question mark
-            r'([^。？！]*[か][？])',
-            # Pattern for questions ending with ka (か) and period
-            r'([^。？！]*[か][。])',
-            # Pattern for questions ending with a question mark
-            r'([^。？！]*[？])',
-            # Pattern for polite questions
-            r'([^。？！]*(?:ですか|ますか|のですか|のでしょうか)[？。]?)',
-            # Pattern for questions with interrogatives
-            r'([^。？！]*(?:何|なに|どう|なぜ|どこ|誰|だれ|いつ|どんな|どの)[^。？！]*[か][？。]?)'
-        ]
+        # Character offset where each segment starts in full_text, for mapping matches back to segments
+        segment_offsets = []
+        offset = 0
+        for segment in formatted_transcript:
+            segment_offsets.append(offset)
+            offset += len(segment["text"]) + 1
+        
+        st.info(f"字幕内の文字数: {len(full_text)}文字 (Transcript length: {len(full_text)} characters)")
         
         # Find all questions in the transcript
-        for pattern in question_patterns:
-            matches = re.finditer(pattern, full_text)
-            for match in matches:
+        seen_questions = set()
+        for pattern in QUESTION_PATTERNS:
+            for match in pattern.finditer(full_text):
                 question_text = match.group(0).strip()
                 
                 # Skip very short questions or duplicates
                 if len(question_text) < 10:
                     continue
                     
-                if question_text in [q["question_text"] for q in actual_questions]:
+                if question_text in seen_questions:
                     continue
+                seen_questions.add(question_text)
                 
-                # Find which segment this question appears in
-                segment_idx = None
-                for idx, segment in enumerate(formatted_transcript):
-                    if question_text in segment["text"]:
-                        segment_idx = idx
-                        break
-                
-                # If we couldn't find the segment, try to find the most relevant one
-                if segment_idx is None:
-                    for idx, segment in enumerate(formatted_transcript):
-                        for word in question_text.split():
-                            if len(word) > 2 and word in segment["text"]:
-                                segment_idx = idx
-                                break
-                        if segment_idx is not None:
-                            break
-                
-                # If we still couldn't find a segment, use the first segment
-                if segment_idx is None:
-                    segment_idx = 0
+                # Find the segment the question starts in (skipping the whitespace strip() removed)
+                question_start = match.start() + len(match.group(0)) - len(match.group(0).lstrip())
+                segment_idx = max(0, bisect.bisect_right(segment_offsets, question_start) - 1)
                 
                 # Get the segment containing this question
                 segment = formatted_transcript[segment_idx]
                 
                 # Get context (surrounding segments)
-                context_before = []
-                for i in range(max(0, segment_idx - 2), segment_idx):
-                    context_before.append(formatted_transcript[i]["text"])
-                    
-                context_after = []
-                for i in range(segment_idx + 1, min(len(formatted_transcript), segment_idx + 3)):
-                    context_after.append(formatted_transcript[i]["text"])
+                context_before = formatted_transcript[max(0, segment_idx - 2):segment_idx]
+                context_after = formatted_transcript[segment_idx + 1:segment_idx + 3]
                 
                 # Add the question
                 actual_questions.append({
                     "question_text": question_text,
                     "segment_start": segment["start"],
                     "segment_end": segment["start"] + segment["duration"],
-                    "context_before": " ".join(context_before),
-                    "context_after": " ".join(context_after)
+                    "context_before": " ".join(seg["text"] for seg in context_before),
+                    "context_after": " ".join(seg["text"] for seg in context_after)
                 })
         
         # Check if we found any questions
@@ -167,25 +179,7 @@ def extract_questions_from_youtube(video_url):
         # Sort questions by timestamp
         actual_questions.sort(key=lambda q: q["segment_start"])
         
-        # If Ollama is available, try to translate the questions
-        if st.session_state.get("ollama_available", False):
-            for question in actual_questions:
-                try:
-                    response = requests.post(
-                        "http://localhost:11434/api/generate",
-                        json={
-                            "model": st.session_state.get("ollama_model", "mistral"),
-                            "prompt": f"Translate this Japanese text to English: {question['question_text']}",
-                        },
-                        stream=False,
-                        timeout=5
-                    )
-                    if response.status_code == 200:
-                        question["english_translation"] = response.json().get('response', '')
-                except:
-                    question["english_translation"] = "(Translation unavailable)"
-        
-        # Return the list of questions
+        # Return the list of questions; callers add translations with translate_questions
         return {
             "type": "questions",
             "questions": actual_questions
@@ -195,6 +189,114 @@ def extract_questions_from_youtube(video_url):
         st.error(f"Error extracting questions: {str(e)}")
         return None
 
+def _translate_text(text, model, timeout):
+    """
+    Translate Japanese text to English using Ollama
+    
+    Parameters:
+        text (str): Japanese text
+        model (str): Ollama model name
+        timeout (tuple): Connect and read timeouts in seconds
+    
+    Returns:
+        str: English translation, or None if the request failed
+    """
+    try:
+        response = OLLAMA_SESSION.post(
+            f"{OLLAMA_URL}/api/generate",
+            json={
+                "model": model,
+                "prompt": f"Translate this Japanese text to English: {text}",
+                "stream": False,
+            },
+            timeout=timeout
+        )
+        if response.status_code == 200:
+            return json_loads(response.content).get('response', '')
+    except (requests.RequestException, ValueError):
+        pass
+    return None
+
+def _translate_batch(texts, model, timeout):
+    """
+    Translate several Japanese texts with one Ollama call
+    
+    The texts are sent as a numbered list and the reply is split back up by
+    its numbering.
+    
+    Parameters:
+        texts (list): Japanese texts
+        model (str): Ollama model name
+        timeout (tuple): Connect and read timeouts in seconds
+    
+    Returns:
+        list: English translations in the same order as texts, or None if the
+        request failed or the reply didn't have a line for every text
+    """
+    # Flatten caption line breaks so each text stays on its own numbered line
+    prompt = "Translate each numbered line from Japanese to English, preserving the numbering. Reply with only the numbered translations, one per line.\n"
+    prompt += "\n".join(f"{i+1}. {' '.join(text.split())}" for i, text in enumerate(texts))
+    
+    try:
+        response = OLLAMA_SESSION.post(
+            f"{OLLAMA_URL}/api/generate",
+            json={"model": model, "prompt": prompt, "stream": False},
+            timeout=timeout
+        )
+        if response.status_code != 200:
+            return None
+        translations = {
+            int(number): text.strip()
+            for number, text in NUMBERED_LINE_PATTERN.findall(json_loads(response.content).get('response', ''))
+        }
+    except (requests.RequestException, ValueError):
+        return None
+    
+    if not all(i + 1 in translations for i in range(len(texts))):
+        return None
+    return [translations[i + 1] for i in range(len(texts))]
+
+def translate_texts(texts, model):
+    """
+    Translate several Japanese texts to English using Ollama
+    
+    All texts go out in one numbered-list prompt, so the model is called
+    once. If the reply can't be matched back to every text, each one is
+    translated separately in a small thread pool instead; there a failed
+    request gives None for that text without affecting the others.
+    
+    Parameters:
+        texts (list): Japanese texts
+        model (str): Ollama model name
+    
+    Returns:
+        list: English translations (or None) in the same order as texts
+    """
+    if not texts:
+        return []
+    # Read the timeout here; the worker threads can't see session state
+    timeout = get_ollama_timeout()
+    
+    translations = _translate_batch(texts, model, timeout)
+    if translations is not None:
+        return translations
+    
+    logger.warning("Batch translation failed, translating one by one")
+    with ThreadPoolExecutor(max_workers=min(len(texts), MAX_PARALLEL_TRANSLATIONS)) as executor:
+        return list(executor.map(lambda text: _translate_text(text, model, timeout), texts))
+
+def translate_questions(questions, model):
+    """
+    Add an English translation to each question using Ollama
+    
+    Parameters:
+        questions (list): Question dictionaries; "english_translation" is set on each
+        model (str): Ollama model name
+    """
+    translations = translate_texts([question["question_text"] for question in questions], model)
+    for question, translation in zip(questions, translations):
+        question["english_translation"] = translation if translation is not None else "(Translation unavailable)"
+
 def extract_conversations(transcript_segments, min_length=30, max_segments=5):
     """
     Extract complete conversation segments from the transcript
@@ -212,39 +314,24 @@ def extract_conversations(transcript_segments, min_length=30, max_segments=5):
     if not transcript_segments:
         return conversations
     
-    # Group transcript segments into conversations
-    current_conversation = {
-        "start_time": transcript_segments[0]["start"],
-        "text": transcript_segments[0]["text"],
-        "segments": [transcript_segments[0]]
-    }
+    # A new conversation starts after a significant pause between segments
+    # (more than 3 seconds); find all of those boundaries in one array operation
+    count = len(transcript_segments)
+    starts = np.fromiter((segment["start"] for segment in transcript_segments), dtype=np.float64, count=count)
+    durations = np.fromiter((segment["duration"] for segment in transcript_segments), dtype=np.float64, count=count)
+    boundaries = np.flatnonzero(starts[1:] - (starts[:-1] + durations[:-1]) > 3.0) + 1
     
-    for i in range(1, len(transcript_segments)):
-        current_segment = transcript_segments[i]
-        previous_segment = transcript_segments[i-1]
-        
-        # Check if there's a significant pause between segments (more than 3 seconds)
-        time_gap = current_segment["start"] - (previous_segment["start"] + previous_segment["duration"])
-        
-        if time_gap > 3.0:  # New conversation if gap > 3 seconds
-            # Save previous conversation if it's long enough
-            if len(current_conversation["text"]) >= min_length:
-                conversations.append(current_conversation)
-            
-            # Start a new conversation
-            current_conversation = {
-                "start_time": current_segment["start"],
-                "text": current_segment["text"],
-                "segments": [current_segment]
-            }
-        else:
-            # Continue current conversation
-            current_conversation["text"] += " " + current_segment["text"]
-            current_conversation["segments"].append(current_segment)
-    
-    # Add the last conversation if it's long enough
-    if len(current_conversation["text"]) >= min_length:
-        conversations.append(current_conversation)
+    # Group transcript segments into conversations, keeping ones that are long enough
+    edges = [0, *boundaries.tolist(), count]
+    for first, end in zip(edges, edges[1:]):
+        segments = transcript_segments[first:end]
+        text = " ".join(segment["text"] for segment in segments)
+        if len(text) >= min_length:
+            conversations.append({
+                "start_time": segments[0]["start"],
+                "text": text,
+                "segments": segments
+            })
     
     # Sort conversations by length (longer ones first) and limit to max_segments
     conversations.sort(key=lambda c: len(c["text"]), reverse=True)
@@ -2,16 +2,18 @@
 YouTube processing utilities for the Listening Learning App frontend
 """
 
-import re
 import streamlit as st
-import requests
 import logging
 import json
 from pathlib import Path
+from functools import lru_cache
+from Listening_Learning_App.frontend.utils.network import BACKEND_SESSION
+from Listening_Learning_App.frontend.utils.youtube_urls import YOUTUBE_ID_PATTERN, VIDEO_ID_PATTERN, YOUTUBE_TIMESTAMP_URL
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=256)
 def extract_youtube_id(url):
     """
     Extract the video ID from a YouTube URL
@@ -34,23 +36,14 @@ def extract_youtube_id(url):
         
     if url.startswith("'") and url.endswith("'"):
         url = url[1:-1]  # Remove quotes
+    
+    # Bare IDs are common and can't match any URL pattern, so check them first
+    if VIDEO_ID_PATTERN.fullmatch(url):
+        return url
         
-    # YouTube URL patterns
-    patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/watch\?v=|youtu\.be\/)([^\/&\?#\s]+)',  # Standard and shortened
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([^\/&\?#\s]+)',  # Embed URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/v\/([^\/&\?#\s]+)',      # Old embed URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/user\/[^\/]+\/([^\/&\?#\s]+)', # User URL
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/.*[?&]v=([^&\s]+)'       # Other formats with v parameter
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            video_id = match.group(1)
-            # Validate the video ID format (should be 11 characters for standard videos)
-            if 11 <= len(video_id) <= 12:
-                return video_id
+    match = YOUTUBE_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
     
     # If no patterns match, this might be a direct video ID
     if 11 <= len(url) <= 12 and url.isalnum() or url.replace('-', '').replace('_', '').isalnum():
@@ -58,6 +51,26 @@ def extract_youtube_id(url):
         
     return None
 
+def add_timestamp_urls(content, video_id):
+    """
+    Store a "timestamp_url" on each extracted item, so rendering doesn't
+    rebuild the link on every rerun
+    
+    Parameters:
+        content (dict): Extracted content (questions or conversations); updated in place
+        video_id (str): ID of the video the content came from, or None for no links
+    """
+    if content["type"] == "questions":
+        for question in content["questions"]:
+            # Use timestamp if available, otherwise use segment_start
+            start_time = question["timestamp"] if "timestamp" in question else question["segment_start"]
+            question["timestamp_url"] = YOUTUBE_TIMESTAMP_URL.format(video_id=video_id, seconds=int(start_time)) if video_id else None
+    else:
+        for conversation in content["conversations"]:
+            # Use the timestamp if available, otherwise use start_time
+            start_time = conversation.get('timestamp', conversation.get('start_time', 0))
+            conversation["timestamp_url"] = YOUTUBE_TIMESTAMP_URL.format(video_id=video_id, seconds=int(start_time)) if video_id else None
+
 def process_custom_video(video_url):
     """
     Process a custom YouTube video URL
@@ -86,7 +99,7 @@ def process_custom_video(video_url):
         backend_url = st.session_state.get("backend_url", "http://localhost:8000")
         api_url = f"{backend_url}/api/videos/process"
         
-        response = requests.post(
+        response = BACKEND_SESSION.post(
             api_url,
             json={"video_url": video_url},
             timeout=5  # 5 second timeout
@@ -98,6 +111,9 @@ def process_custom_video(video_url):
             
             # Store the processing job ID in session state
             st.session_state.processing_job_id = result.get("job_id")
+            
+            # Exercises for this video are about to change, drop cached results
+            _fetch_exercises.clear()
             return True
         else:
             st.error(f"Error processing video: {response.text}")
@@ -106,6 +122,26 @@ def process_custom_video(video_url):
         st.error(f"Error processing video: {str(e)}")
         return False
 
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_exercises(backend_url, video_id):
+    """
+    Fetch exercises for a video from the backend, cached for ten minutes
+    
+    Parameters:
+        backend_url (str): Base URL of the backend server
+        video_id (str): YouTube video ID
+    
+    Returns:
+        list: List of exercises, or None if the backend has none for this video
+    """
+    response = BACKEND_SESSION.get(f"{backend_url}/api/exercises/video/{video_id}", timeout=5)
+    
+    if response.status_code == 404:
+        return None
+    
+    response.raise_for_status()
+    return response.json()
+
 def load_exercises(video_id):
     """
     Load exercises for a specific video
@@ -121,23 +157,17 @@ def load_exercises(video_id):
         st.error("Backend server is not running. Cannot load exercises.")
         return None
     
-    # Make API request to backend
+    # Make API request to backend (or reuse a recent cached result)
     try:
         backend_url = st.session_state.get("backend_url", "http://localhost:8000")
-        api_url = f"{backend_url}/api/exercises/video/{video_id}"
-        
-        response = requests.get(api_url, timeout=5)
+        exercises = _fetch_exercises(backend_url, video_id)
         
-        if response.status_code == 200:
-            exercises = response.json()
-            st.session_state.exercises = exercises
-            return exercises
-        elif response.status_code == 404:
+        if exercises is None:
             st.warning("No exercises found for this video")
             return []
-        else:
-            st.error(f"Error loading exercises: {response.text}")
-            return None
+        
+        st.session_state.exercises = exercises
+        return exercises
     except Exception as e:
         st.error(f"Error loading exercises: {str(e)}")
         return None 
\ No newline at end of file
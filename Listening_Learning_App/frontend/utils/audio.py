@@ -6,7 +6,6 @@ import streamlit as st
 import os
 import base64
 import logging
-from pathlib import Path
 import tempfile
 
 # Configure logging
@@ -51,11 +50,13 @@ def get_audio_player(audio_path, autoplay=False):
         }
         mime_type = mime_types.get(file_ext, 'audio/mpeg')
         
-        # Read audio file
-        audio_bytes = Path(audio_path).read_bytes()
-        
-        # Encode as base64
-        audio_base64 = base64.b64encode(audio_bytes).decode()
+        # Encode as base64 in chunks rather than reading the whole file first.
+        # The chunk size is a multiple of 3 bytes so the pieces join without padding.
+        encoded_chunks = []
+        with open(audio_path, 'rb') as f:
+            while chunk := f.read(57 * 1024):
+                encoded_chunks.append(base64.b64encode(chunk).decode('ascii'))
+        audio_base64 = "".join(encoded_chunks)
         
         # Create HTML audio element
         audio_html = f"""
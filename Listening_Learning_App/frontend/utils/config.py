@@ -6,28 +6,35 @@ import json
 import os
 import logging
 from pathlib import Path
+from functools import lru_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _read_config():
+    """Parse config.json; cached until save_config() writes a new version"""
+    config_path = Path(__file__).parents[2] / "config.json"
+    
+    if not os.path.isfile(config_path):
+        logger.warning(f"Config file not found: {config_path}")
+        return {}
+        
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
 def load_config():
     """
     Load configuration from config file
     
+    The file is only read on the first call (and after save_config);
+    callers get a copy they are free to modify.
+    
     Returns:
         dict: Configuration dictionary
     """
     try:
-        config_path = Path(__file__).parents[2] / "config.json"
-        
-        if not os.path.isfile(config_path):
-            logger.warning(f"Config file not found: {config_path}")
-            return {}
-            
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-            
-        return config
+        return dict(_read_config())
     except Exception as e:
         logger.error(f"Error loading config: {e}")
         return {}
@@ -47,7 +54,8 @@ def save_config(config):
         
         with open(config_path, 'w') as f:
             json.dump(config, f, indent=4)
-            
+        
+        _read_config.cache_clear()
         return True
     except Exception as e:
         logger.error(f"Error saving config: {e}")
@@ -79,5 +87,8 @@ def set_config_value(key, value):
         bool: True if successful, False otherwise
     """
     config = load_config()
+    if key in config and config[key] == value:
+        # Nothing changed, skip the disk write
+        return True
     config[key] = value
     return save_config(config) 
\ No newline at end of file
@@ -4,21 +4,135 @@ Network utility functions for the Listening Learning App frontend
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+import atexit
+import os
 import socket
+import select
+import time
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so backend requests from every module reuse keep-alive
+# connections instead of opening a new one per call. Each localhost port gets
+# its own pool, so keep enough pools for a full backend port scan.
+BACKEND_SESSION = requests.Session()
+BACKEND_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=20))
+BACKEND_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+atexit.register(BACKEND_SESSION.close)
+
+# Shared HTTP session for the local Ollama server, so repeated translations
+# reuse a keep-alive connection
+OLLAMA_URL = "http://localhost:11434"
+OLLAMA_SESSION = requests.Session()
+OLLAMA_SESSION.mount(OLLAMA_URL, HTTPAdapter(pool_connections=1, pool_maxsize=8))
+atexit.register(OLLAMA_SESSION.close)
+
+# Seconds to wait for the Ollama server to accept a connection
+OLLAMA_CONNECT_TIMEOUT = 5
+
+# Allowed range for the Ollama reply timeout, shared with the sidebar input
+OLLAMA_MIN_TIMEOUT = 1.0
+OLLAMA_MAX_TIMEOUT = 600.0
+
+def parse_timeout(value, default):
+    """
+    Parse a timeout in seconds, falling back to a default
+    
+    Valid values are clamped to OLLAMA_MIN_TIMEOUT..OLLAMA_MAX_TIMEOUT so they
+    always fit the sidebar's timeout input.
+    
+    Parameters:
+        value: Timeout to parse (str, number or None)
+        default (float): Value used when the timeout is missing, invalid or not positive
+    
+    Returns:
+        float: Timeout in seconds
+    """
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not timeout > 0:
+        return default
+    return min(max(timeout, OLLAMA_MIN_TIMEOUT), OLLAMA_MAX_TIMEOUT)
+
+# Seconds to wait for an Ollama reply. Local models can take longer than ten
+# seconds just to produce the first token, so the default is generous.
+OLLAMA_TIMEOUT = parse_timeout(os.environ.get("OLLAMA_REQUEST_TIMEOUT_S"), 120.0)
+
+def get_ollama_timeout():
+    """
+    Get the (connect, read) timeout for Ollama requests
+    
+    Uses the timeout chosen in this session if there is one. Call this from
+    the script thread; worker threads can't read session state.
+    
+    Returns:
+        tuple: Connect and read timeouts in seconds
+    """
+    return (OLLAMA_CONNECT_TIMEOUT, parse_timeout(st.session_state.get("ollama_timeout"), OLLAMA_TIMEOUT))
+
 def is_port_in_use(port):
     """Check if a port is in use"""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
+def probe_ports(ports, timeout=0.1):
+    """
+    Check which ports accept TCP connections, all within one select() timeout
+    
+    Every connect is started without blocking, then select() waits for all of
+    them together, so N ports cost one timeout window instead of N.
+    
+    Parameters:
+        ports (list): Ports to check on localhost
+        timeout (float): Seconds to wait for the connections
+    
+    Returns:
+        set: The ports that accepted a connection
+    """
+    pending = {}
+    open_ports = set()
+    try:
+        for port in ports:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setblocking(False)
+            pending[s] = port
+            s.connect_ex(('localhost', port))
+        
+        # select() returns as soon as any connect finishes, so keep waiting on
+        # the rest until they have all finished or the time is up
+        waiting = set(pending)
+        deadline = time.monotonic() + timeout
+        while waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _, writable, _ = select.select([], list(waiting), [], remaining)
+            for s in writable:
+                waiting.discard(s)
+                if s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    open_ports.add(pending[s])
+    finally:
+        for s in pending:
+            s.close()
+    
+    return open_ports
+
+# Seconds to reuse a backend discovery result before scanning again
+BACKEND_DISCOVERY_TTL = 30
+
+@st.cache_data(ttl=BACKEND_DISCOVERY_TTL, show_spinner=False)
 def find_backend_server():
     """
     Find the backend server by checking common ports.
     Returns the backend URL if found, otherwise None.
+    
+    The result is cached for BACKEND_DISCOVERY_TTL seconds, so reruns
+    within that window don't probe the ports again.
     """
     # Get backend port from config or use default
     backend_port = 8000  # Default
@@ -27,11 +141,14 @@ def find_backend_server():
     possible_ports = [backend_port, 8080, 5000]
     backend_url = None
 
-    for port in possible_ports:
+    # Only send /health to ports where something is listening
+    open_ports = probe_ports(possible_ports)
+
+    for port in (p for p in possible_ports if p in open_ports):
         try:
             # Test if the backend is running on this port
             url = f"http://localhost:{port}/health"
-            response = requests.get(url, timeout=1)
+            response = BACKEND_SESSION.get(url, timeout=1)
             
             if response.status_code == 200:
                 # Found a valid backend
@@ -3,6 +3,7 @@ Session state management for the Listening Learning App frontend
 """
 
 import streamlit as st
+from Listening_Learning_App.frontend.utils.network import OLLAMA_TIMEOUT
 
 # Define app states
 APP_STATES = {
@@ -18,19 +19,24 @@ APP_STATES = {
 # Additional app states
 APP_STATE_EXTRACT_QUESTIONS = "EXTRACT_QUESTIONS"
 
+# Default session state values, set once per session by initialize_session_state.
+# Keep these immutable; a mutable default would be shared by every session.
+SESSION_DEFAULTS = {
+    "app_state": APP_STATES["HOME"],
+    "backend_available": False,
+    "ollama_available": False,
+    "ollama_model": "mistral",
+    "ollama_timeout": OLLAMA_TIMEOUT,
+    # Question extraction page state
+    "youtube_url": "",
+    "youtube_video_id": None,
+    "extracted_content": None,
+}
+
 def initialize_session_state():
     """Initialize session state variables"""
-    if "app_state" not in st.session_state:
-        st.session_state["app_state"] = APP_STATES["HOME"]
-        
-    # Check if backend is running
-    if "backend_available" not in st.session_state:
-        st.session_state["backend_available"] = False
-        
-    # Check if Ollama is available
-    if "ollama_available" not in st.session_state:
-        st.session_state["ollama_available"] = False
-        st.session_state["ollama_model"] = "mistral"
+    for key, value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, value)
 
 # Navigation functions
 def go_to_home():
@@ -53,7 +59,7 @@ def go_to_practice(video_id):
     
     # Load exercises for this video
     try:
-        from processors.video import load_exercises
+        from Listening_Learning_App.frontend.processors.youtube import load_exercises
         load_exercises(video_id)
     except:
         # Will be handled in the practice page
@@ -86,5 +92,16 @@ def go_to_extract_questions():
     st.session_state.app_state = APP_STATE_EXTRACT_QUESTIONS
     
     # Clear any previous extraction results when navigating to the page
-    if "extracted_content" in st.session_state:
-        del st.session_state["extracted_content"] 
\ No newline at end of file
+    st.session_state["extracted_content"] = None
+
+def start_direct_extraction():
+    """Open the extract questions page for the URL entered on the video selection page"""
+    youtube_url = st.session_state.get("direct_extract_url", "")
+    if youtube_url:
+        st.session_state["youtube_url"] = youtube_url
+        go_to_extract_questions()
+
+def leave_extraction(navigate):
+    """Clear extraction results, then navigate with the given function"""
+    st.session_state["extracted_content"] = None
+    navigate() 
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""
+YouTube URL patterns and templates for the Listening Learning App frontend
+
+This module has no dependencies outside the standard library, so both the
+modular pages and main.py can import it.
+"""
+
+import re
+
+# Video ID inside a YouTube URL: youtu.be/<id>, embed/, v/, shorts/, live/,
+# user/<name>/, watch?v= or &v=, vi=, and URL-encoded attribution links. The
+# host must be youtube.com, youtube-nocookie.com or youtu.be, and the ID may be
+# followed by a trailing slash. Other path segments, such as channel names
+# under /c/, are never taken as an ID.
+YOUTUBE_ID_PATTERN = re.compile(
+    r'(?<![\w-])(?:youtube(?:-nocookie)?\.com|youtu\.be)(?![\w.-])\S*?'
+    r'(?:(?<=youtu\.be)/|/(?:embed|v|shorts|live|user/[^/\s]+)/|[?&]vi?=|v%3D)'
+    r'([0-9A-Za-z_-]{11,12})(?=[%#?&/]|$)'
+)
+
+# A bare video ID pasted without the URL around it
+VIDEO_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{11,12}')
+
+# YouTube watch links, filled in with str.format
+YOUTUBE_WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+YOUTUBE_TIMESTAMP_URL = YOUTUBE_WATCH_URL + "&t={seconds}s"
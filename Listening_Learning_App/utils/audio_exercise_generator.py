@@ -5,7 +5,6 @@ import time
 import uuid
 from pathlib import Path
 import random
-import gc
 import re
 import traceback
 from datetime import datetime
@@ -17,6 +16,11 @@ from .japanese_tts import JapaneseTTS
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Patterns used when parsing generated exercises and stored files
+JSON_BLOCK_PATTERN = re.compile(r'```json\s*(.*?)```', re.DOTALL)
+EXERCISE_FILENAME_PATTERN = re.compile(r'exercise_([a-f0-9-]+)\.json')
+SPEAKER_TAG_PATTERN = re.compile(r'\[(MALE|FEMALE|MAN|WOMAN|男性|女性)\]:')
+
 # Define paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 EXERCISES_DIR = DATA_DIR / "exercises"
@@ -375,7 +379,7 @@ class AudioExerciseGenerator:
                     exercise_id = exercise.get("id", "unknown")
                     if exercise_id == "unknown":
                         # Try to extract ID from filename
-                        match = re.search(r'exercise_([a-f0-9-]+)\.json', file_path_str)
+                        match = EXERCISE_FILENAME_PATTERN.search(file_path_str)
                         if match:
                             exercise_id = match.group(1)
                             logger.info(f"Extracted ID from filename: {exercise_id}")
@@ -566,7 +570,7 @@ Return ONLY the JSON array, nothing else.
             response = await self.ollama_client.generate(prompt, system_prompt, temperature=0.7, max_tokens=1024)
             
             # Extract JSON from the response
-            json_match = re.search(r'```json\s*(.*?)```', response, re.DOTALL)
+            json_match = JSON_BLOCK_PATTERN.search(response)
             if json_match:
                 json_str = json_match.group(1).strip()
             else:
@@ -620,7 +624,7 @@ Return ONLY the JSON array, nothing else.
                 from gtts import gTTS
                 
                 # Simplify the script for TTS by removing speaker indicators
-                simple_script = re.sub(r'\[(MALE|FEMALE|MAN|WOMAN|男性|女性)\]:', '', script)
+                simple_script = SPEAKER_TAG_PATTERN.sub('', script)
                 simple_script = simple_script.replace('\n', ' ').strip()
                 
                 # If script is too long, take just the first part
@@ -1,6 +1,7 @@
 import os
 import sys
 import importlib
+import importlib.util
 import subprocess
 import platform
 import shutil
@@ -61,11 +62,11 @@ def check_python_packages():
     installed_packages = []
     
     for package in REQUIRED_PACKAGES:
-        try:
-            # Try to import the package
-            importlib.import_module(package)
+        # Locate the package without importing it; importing heavy packages
+        # like whisper just to check they exist slows down startup
+        if importlib.util.find_spec(package) is not None:
             installed_packages.append(package)
-        except ImportError:
+        else:
             missing_packages.append(package)
     
     return missing_packages, installed_packages
@@ -9,7 +9,6 @@ from gtts import gTTS
 import random
 import re
 import uuid
-import gc
 import shutil
 
 # Configure logging
@@ -452,9 +451,6 @@ class JapaneseTTS:
             else:
                 output_path = output_dir / f"exercise_{uuid.uuid4()}.mp3"
             
-            # Force garbage collection before processing
-            gc.collect()
-            
             # Instead of parsing the script into segments, just generate one file for the entire script
             # This is much simpler and more reliable
             try:
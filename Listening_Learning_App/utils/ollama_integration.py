@@ -4,7 +4,6 @@ import logging
 import requests
 import random
 import time
-import gc
 import re
 from typing import List, Dict, Any, Optional
 
@@ -19,6 +18,9 @@ DEFAULT_PORT = 11434
 DEFAULT_TIMEOUT = 60  # seconds
 DEFAULT_MAX_TOKENS = 1024  # Limit token count to save memory
 
+# JSON inside a ```json fenced block in a model response
+JSON_BLOCK_PATTERN = re.compile(r'```json\s*(.*?)```', re.DOTALL)
+
 class OllamaClient:
     """Client for interacting with the Ollama API"""
     
@@ -28,9 +30,6 @@ class OllamaClient:
         self.base_url = f"http://{host}:{port}"
         self.timeout = timeout
         
-        # Run GC to clean up any lingering memory
-        gc.collect()
-        
     def check_availability(self):
         """Check if Ollama is available and the model is loaded"""
         try:
@@ -76,9 +75,6 @@ class OllamaClient:
         Returns:
             str: Generated text
         """
-        # Run GC before making the API call to free up memory
-        gc.collect()
-        
         # Ensure max_tokens doesn't exceed our limit
         if max_tokens > DEFAULT_MAX_TOKENS:
             logger.warning(f"Reducing max_tokens from {max_tokens} to {DEFAULT_MAX_TOKENS} to save memory")
@@ -164,9 +160,6 @@ class OllamaClient:
         except Exception as e:
             logger.error(f"Error generating response from Ollama: {str(e)}")
             raise
-        finally:
-            # Clean up after API call
-            gc.collect()
 
 async def generate_exercises(
     transcript_segments, 
@@ -685,7 +678,7 @@ async def extract_natural_questions_from_transcript(transcript_segments, max_que
         # Try to extract JSON from the response
         try:
             # First look for JSON between triple backticks
-            json_match = re.search(r'```json\s*(.*?)```', response, re.DOTALL)
+            json_match = JSON_BLOCK_PATTERN.search(response)
             if json_match:
                 json_str = json_match.group(1).strip()
             else: